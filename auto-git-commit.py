@@ -7,11 +7,13 @@ Gemini APIを使用してコミットメッセージを生成し、Conventional
 
 機能:
 - .gitignoreに記載されたファイルは自動的に除外されます
-- バイナリファイルの差分はコミットメッセージ生成時に除外されます
+- バイナリファイルは差分の内容を含めず、変更されたことのみをコミットメッセージ生成に使います
 - コミットメッセージの前後のクォートを自動的に除去します
+- 同じ変更内容に対して生成したコミットメッセージは7日間キャッシュされます
 
 使用方法:
     Claude Codeの設定ファイル(~/.claude/settings.json)でStopフックとして設定します。
+    auto-git-commit.shは変更がない場合にPythonを起動せずに終了するラッパーです。
 
     設定例:
     {
@@ -22,7 +24,7 @@ Gemini APIを使用してコミットメッセージを生成し、Conventional
             "hooks": [
               {
                 "type": "command",
-                "command": "python3 /path/to/claude-code-auto-commit/auto-git-commit.py",
+                "command": "/path/to/claude-code-auto-commit/auto-git-commit.sh",
                 "timeout": 30
               }
             ]
@@ -42,11 +44,12 @@ Gemini APIを使用してコミットメッセージを生成し、Conventional
     1: エラー終了（Gitリポジトリでない、geminiコマンドがない、gemini失敗など）
 """
 
-import json
 import os
+import posixpath
 import re
 import subprocess
 import sys
+import time
 
 # 定数
 # Conventional Commitsのプレフィックス一覧
@@ -84,10 +87,33 @@ Conventional Commits形式の規則:
 {detailed_changes}
 </修正内容>"""
 
+# プロンプトに埋め込むプレフィックス一覧（実行ごとに組み立てないよう読み込み時に作成）
+PREFIXES_STR = "、".join(f"`{p}`" for p in CONVENTIONAL_PREFIXES)
+
 # デフォルト設定
 DEFAULT_COMMIT_MESSAGE = "chore: Claude Codeによる自動修正"
 DEFAULT_MODEL = "gemini-2.5-flash"
 
+# プロンプトに含める差分の最大文字数
+MAX_DIFF_CHARS = 5000
+# git diffから読み込む最大バイト数
+DIFF_READ_LIMIT = 32768
+
+# キャッシュディレクトリ（XDG_CACHE_HOMEが設定されていればその配下）
+CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"),
+    "claude-code-auto-commit",
+)
+# コミットメッセージのキャッシュ有効期間（7日）
+MESSAGE_CACHE_TTL = 7 * 24 * 60 * 60
+
+# hookの入力JSONからエスケープを含まないcwdを取り出すパターン
+CWD_PATTERN = re.compile(r'"cwd"\s*:\s*"([^"\\]*)"')
+
+# git status --porcelain=v2 の各エントリ種別でパスが何番目の項目か
+# 1: 通常の変更、2: リネーム・コピー、u: コンフリクト
+STATUS_V2_PATH_INDEX = {b"1": 8, b"2": 9, b"u": 10}
+
 
 def strip_quotes(text):
     """文字列の前後のクォート（シングル、ダブル、バック）を除去する
@@ -104,78 +130,208 @@ def strip_quotes(text):
     # 前後の空白を除去
     text = text.strip()
 
-    # クォート文字のリスト
-    quotes = ["'", '"', "`"]
-
     # 前後に同じクォートがある場合のみ除去
-    for quote in quotes:
-        if len(text) >= 2 and text.startswith(quote) and text.endswith(quote):
-            return text[1:-1].strip()
+    quote = text[:1]
+    if len(text) >= 2 and quote in ("'", '"', "`") and text[-1] == quote:
+        return text[1:-1].strip()
 
     return text
 
 
-def filter_binary_diff(diff_text):
-    """git diffの出力からバイナリファイルの差分を除外する
+def find_gemini():
+    """geminiコマンドのパスを返す
+
+    解決したパスはキャッシュに保存し、次回以降はそのパスが実行可能であれば
+    PATHの探索を省略する。
+
+    Returns:
+        str or None: geminiコマンドのパス。見つからない場合はNone
+    """
+    cache_path = os.path.join(CACHE_DIR, "gemini_path")
+    try:
+        with open(cache_path, encoding="utf-8") as f:
+            cached_path = f.read().strip()
+        if cached_path and os.access(cached_path, os.X_OK):
+            return cached_path
+    except OSError:
+        pass
+
+    # キャッシュが使えない場合のみ読み込み、通常の起動ではimportを省略する
+    import shutil
+
+    gemini_path = shutil.which("gemini")
+    if gemini_path is not None:
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            with open(cache_path, "w", encoding="utf-8") as f:
+                f.write(gemini_path)
+        except OSError:
+            pass
+    return gemini_path
+
+
+def get_message_cache_path(prompt, tree_hash):
+    """プロンプトとステージング内容に対応するキャッシュファイルのパスを返す
+
+    プロンプトが同じでもステージングされた内容が異なれば別のキーになるよう、
+    インデックスのツリーハッシュもキーに含める。
 
     Args:
-        diff_text (str): git diffの出力
+        prompt (str): geminiに渡すプロンプト
+        tree_hash (str): git write-treeで取得したインデックスのツリーハッシュ
 
     Returns:
-        str: バイナリファイルの差分を除外した出力
+        str: ツリーハッシュとプロンプトのSHA-256ハッシュをファイル名とする
+            キャッシュファイルのパス
     """
-    if not diff_text:
-        return diff_text
-
-    lines = diff_text.split("\n")
-    filtered_lines = []
-    i = 0
-
-    while i < len(lines):
-        line = lines[i]
-
-        # diff --git から始まるブロックを検出
-        if line.startswith("diff --git"):
-            # このブロックの開始位置を記録
-            block_start = i
-            i += 1
-
-            # ブロックの終わりまたはバイナリファイルの検出
-            is_binary = False
-            while i < len(lines) and not lines[i].startswith("diff --git"):
-                if "Binary files" in lines[i] and "differ" in lines[i]:
-                    is_binary = True
-                    break
-                i += 1
+    # 変更がない場合の起動を速くするため、キャッシュを使う場合のみ読み込む
+    import hashlib
 
-            # バイナリファイルでない場合はブロックを保持
-            if not is_binary:
-                for j in range(block_start, i):
-                    filtered_lines.append(lines[j])
-            else:
-                # バイナリファイルの場合、次のdiffブロックまでスキップ
-                while i < len(lines) and not lines[i].startswith("diff --git"):
-                    i += 1
-                i -= 1  # ループの最後でi+=1されるため
+    key = hashlib.sha256(f"{tree_hash}\0{prompt}".encode("utf-8")).hexdigest()
+    return os.path.join(CACHE_DIR, "messages", key)
+
+
+def load_cached_message(prompt, tree_hash):
+    """キャッシュからコミットメッセージを読み込む
+
+    Args:
+        prompt (str): geminiに渡すプロンプト
+        tree_hash (str): インデックスのツリーハッシュ
+
+    Returns:
+        str or None: 有効期間内のキャッシュがあればそのメッセージ、なければNone
+    """
+    path = get_message_cache_path(prompt, tree_hash)
+    try:
+        if time.time() - os.path.getmtime(path) > MESSAGE_CACHE_TTL:
+            # 期限切れのキャッシュは削除する
+            os.remove(path)
+            return None
+        with open(path, encoding="utf-8") as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+
+def prune_message_cache(cache_dir):
+    """有効期間を過ぎたコミットメッセージのキャッシュを削除する
+
+    キャッシュはコミットごとに増えるため、保存時に古いものを削除して
+    ディレクトリの大きさを一定に保つ。削除に失敗したファイルは無視する。
+
+    Args:
+        cache_dir (str): コミットメッセージのキャッシュディレクトリ
+    """
+    expire_before = time.time() - MESSAGE_CACHE_TTL
+    try:
+        entries = list(os.scandir(cache_dir))
+    except OSError:
+        return
+    for entry in entries:
+        try:
+            if entry.is_file() and entry.stat().st_mtime < expire_before:
+                os.remove(entry.path)
+        except OSError:
+            pass
+
+
+def save_cached_message(prompt, tree_hash, message):
+    """コミットメッセージをキャッシュに保存する
+
+    保存の前に有効期間を過ぎたキャッシュを削除する。
+    キャッシュの保存に失敗してもコミット処理には影響させない。
+
+    Args:
+        prompt (str): geminiに渡したプロンプト
+        tree_hash (str): インデックスのツリーハッシュ
+        message (str): 生成されたコミットメッセージ
+    """
+    path = get_message_cache_path(prompt, tree_hash)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    prune_message_cache(os.path.dirname(path))
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(message)
+        # 同時に実行された別のhookが途中まで書いたファイルを読まないよう置き換える
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+
+def parse_status(status_output):
+    """git status --porcelain=v2 -z の出力を解析する
+
+    Args:
+        status_output (bytes): git status --porcelain=v2 -z の出力
+
+    Returns:
+        list: (xy: str, path: str) のタプルのリスト
+            - xy: インデックスとワークツリーの状態を表す2文字
+                  （git status --shortと同じく、変更なしは空白で表す）
+            - path: ファイルのパス（リネームの場合は変更後のパス）
+    """
+    entries = []
+    fields = iter(status_output.split(b"\0"))
+    for field in fields:
+        kind = field[:1]
+        if kind in STATUS_V2_PATH_INDEX:
+            # 通常の変更・リネーム・コンフリクトは固定数の項目の後にパスが続く
+            path_index = STATUS_V2_PATH_INDEX[kind]
+            items = field.split(b" ", path_index)
+            xy = items[1].decode("ascii").replace(".", " ")
+            path = items[path_index]
+            # リネーム・コピーの場合は変更前のパスが次のフィールドに続く
+            if kind == b"2":
+                next(fields, None)
+        elif kind in (b"?", b"!"):
+            # 未追跡・無視されたファイルは記号の後にパスのみが続く
+            xy = kind.decode("ascii") * 2
+            path = field[2:]
         else:
-            filtered_lines.append(line)
+            continue
+        entries.append((xy, decode_output(path)))
+    return entries
 
-        i += 1
 
-    return "\n".join(filtered_lines)
+def format_numstat(numstat_output):
+    """git diff --numstat の出力を変更内容の要約に整形する
+
+    Args:
+        numstat_output (str): git diff --numstat の出力
+
+    Returns:
+        str: 1ファイル1行で「+追加行数 -削除行数 パス」を並べた要約
+            （バイナリファイルは行数の代わりに「(バイナリ)」と表示する）
+    """
+    lines = []
+    for line in numstat_output.splitlines():
+        items = line.split("\t", 2)
+        # 読み込みの上限で途中が切れた行は除外する
+        if len(items) != 3:
+            continue
+        added, deleted, path = items
+        if added == "-":
+            lines.append(f"(バイナリ) {path}")
+        else:
+            lines.append(f"+{added} -{deleted} {path}")
+    return "\n".join(lines)
 
 
-def run_command(cmd, cwd=None, capture_output=True, shell=True):
-    """シェルコマンドを実行して結果を返す
+def run_command(argv, cwd=None, capture_output=True, stdin_data=None):
+    """コマンドをシェルを経由せずに実行して結果を返す
+
+    出力はデコードせずにバイト列のまま返す。内容を文字列として扱う場合は
+    呼び出し側でdecode_outputを使用する。
 
     Args:
-        cmd (str or list): 実行するコマンド文字列またはリスト
+        argv (list): 実行するコマンドと引数のリスト
         cwd (str, optional): 作業ディレクトリ。デフォルトはNone
         capture_output (bool, optional): 出力をキャプチャするか。デフォルトはTrue
-        shell (bool, optional): シェル経由で実行するか。デフォルトはTrue
+        stdin_data (bytes, optional): 標準入力に渡すデータ。デフォルトはNone
 
     Returns:
-        tuple: (success: bool, stdout: str, stderr: str)
+        tuple: (success: bool, stdout: bytes, stderr: bytes)
             - success: コマンドが正常終了したか（returncode == 0）
             - stdout: 標準出力の内容（capture_output=Trueの場合）
             - stderr: 標準エラー出力の内容（capture_output=Trueの場合）
@@ -183,18 +339,75 @@ def run_command(cmd, cwd=None, capture_output=True, shell=True):
     try:
         if capture_output:
             result = subprocess.run(
-                cmd,
-                shell=shell,
+                argv,
                 cwd=cwd,
+                input=stdin_data,
                 capture_output=True,
-                text=True,
             )
             return result.returncode == 0, result.stdout.strip(), result.stderr.strip()
         else:
-            result = subprocess.run(cmd, shell=shell, cwd=cwd)
-            return result.returncode == 0, "", ""
+            result = subprocess.run(argv, cwd=cwd, input=stdin_data)
+            return result.returncode == 0, b"", b""
     except Exception as e:
-        return False, "", str(e)
+        return False, b"", str(e).encode("utf-8")
+
+
+def decode_output(data):
+    """コマンドの出力をUTF-8の文字列に変換する
+
+    Args:
+        data (bytes): コマンドの出力
+
+    Returns:
+        str: デコードした文字列（不正なバイトは置換文字になる）
+    """
+    return data.decode("utf-8", errors="replace")
+
+
+def read_command_head(argv, limit, cwd=None):
+    """コマンドの標準出力を先頭から指定バイト数まで読み込む
+
+    出力が上限を超えた時点でプロセスを終了するため、巨大な出力でも
+    メモリ使用量と処理時間は上限の分だけで済む。
+
+    Args:
+        argv (list): 実行するコマンドと引数のリスト
+        limit (int): 読み込む最大バイト数
+        cwd (str, optional): 作業ディレクトリ。デフォルトはNone
+
+    Returns:
+        tuple: (output: bytes, truncated: bool)
+            - output: 読み込んだ標準出力の内容（デコードはしない）
+            - truncated: 上限に達したため途中で読み込みを打ち切ったか
+    """
+    try:
+        process = subprocess.Popen(
+            argv,
+            cwd=cwd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+    except Exception:
+        return b"", False
+
+    buffer = bytearray()
+    truncated = False
+    try:
+        while len(buffer) < limit:
+            chunk = process.stdout.read1(limit - len(buffer))
+            if not chunk:
+                break
+            buffer += chunk
+        else:
+            # 上限ちょうどで出力が終わっている場合は打ち切り扱いにしない
+            truncated = bool(process.stdout.read(1))
+    finally:
+        if truncated:
+            process.kill()
+        process.stdout.close()
+        process.wait()
+
+    return bytes(buffer), truncated
 
 
 def main():
@@ -225,72 +438,113 @@ def main():
     # 入力データを読み込む
     input_data_str = sys.stdin.read()
 
-    try:
-        input_data = json.loads(input_data_str)
-        cwd = input_data.get("cwd", ".")
-    except (json.JSONDecodeError, AttributeError):
-        cwd = "."
+    # 通常の入力はcwdをパターンで取り出し、エスケープを含む場合のみJSONとして解析する
+    match = CWD_PATTERN.search(input_data_str)
+    if match:
+        cwd = match.group(1)
+    else:
+        import json
+
+        try:
+            input_data = json.loads(input_data_str)
+            cwd = input_data.get("cwd", ".")
+        except (json.JSONDecodeError, AttributeError):
+            cwd = "."
 
-    # 作業ディレクトリに移動
-    os.chdir(cwd)
+    # 作業ディレクトリはos.chdirで移動せず、各コマンドの実行時にcwdとして渡す
 
-    # Git管理下かチェック
-    success, _, _ = run_command("git rev-parse --git-dir")
-    if not success:
+    # Git管理下かチェック（ワークツリー内であれば"true"が出力される）
+    # 同じ呼び出しで、リポジトリのルートから見たcwdのパス（末尾に/付き）も取得する
+    success, rev_parse_output, _ = run_command(
+        ["git", "rev-parse", "--is-inside-work-tree", "--show-prefix"], cwd=cwd
+    )
+    rev_parse_lines = decode_output(rev_parse_output).splitlines()
+    if not success or rev_parse_lines[:1] != ["true"]:
         print("エラー: Gitリポジトリではありません", file=sys.stderr)
         sys.exit(1)
+    cwd_prefix = rev_parse_lines[1] if len(rev_parse_lines) > 1 else ""
 
-    # 変更があるかチェック
-    success, output, _ = run_command("git status --porcelain")
-    if not output:
+    # 作業ツリーの状態を1回だけ取得し、コミット前後の判定の両方に使う
+    # 未追跡ファイルの表示はユーザーのstatus.showUntrackedFiles設定に従う
+    # （ラッパーのgit status --porcelainと同じ判定になるようにする）
+    success, status_output, _ = run_command(
+        ["git", "--no-optional-locks", "status", "--porcelain=v2", "-z"], cwd=cwd
+    )
+    status_entries = parse_status(status_output)
+    if not status_entries:
         print("変更はありません。コミットをスキップします。", file=sys.stderr)
         sys.exit(0)
 
-    # geminiコマンドが利用可能かチェック
-    success, _, _ = run_command("command -v gemini")
-    if not success:
+    # geminiコマンドが利用可能かチェック（サブプロセスは起動しない）
+    gemini_path = find_gemini()
+    if gemini_path is None:
         print(
             "エラー: geminiコマンドが見つかりません。geminiをインストールしてください。",
             file=sys.stderr,
         )
         sys.exit(1)
 
-    # 変更内容を取得
-    success, changes, _ = run_command("git diff --cached --stat")
-    if not changes:
+    # ステージング済みの変更があるか（インデックス側の状態が空白・未追跡・無視以外）
+    has_staged = any(xy[0] not in " ?!" for xy, _ in status_entries)
+    if has_staged:
+        # コミット後もワークツリー側に変更が残るエントリ
+        remaining_entries = [
+            (xy, path) for xy, path in status_entries if xy[1] != " "
+        ]
+    else:
         # ステージングされていない場合は、すべての変更をステージング
         # git add -A は .gitignore に記載されたファイルを自動的に除外する
-        run_command("git add -A", capture_output=False)
-        success, changes, _ = run_command("git diff --cached --stat")
+        run_command(["git", "add", "-A"], cwd=cwd, capture_output=False)
+        remaining_entries = []
+
+    # 変更の要約と詳細を1回のgit diffで取得する
+    # --numstat -p では要約の後に空行を挟んで差分の詳細が続く
+    # 差分全体は読み込まず、先頭から必要な分だけをストリームで読み込む
+    # バイナリファイルは--binaryを指定しない限り「Binary files ... differ」の
+    # 1行のみが出力されるため、除外しなくてもプロンプトは大きくならない
+    # キャッシュのキーに使うツリーハッシュは、差分の読み込みと並行して取得する
+    # 変更がない場合の起動を速くするため、ここで初めて読み込む
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        tree_future = executor.submit(run_command, ["git", "write-tree"], cwd=cwd)
+
+        print("git diff --cachedを実行中...", file=sys.stderr)
+        raw_output, truncated = read_command_head(
+            ["git", "diff", "--cached", "--no-color", "--numstat", "-p"],
+            DIFF_READ_LIMIT,
+            cwd=cwd,
+        )
 
-    print(f"changes: {changes}", file=sys.stderr)
+        success, tree_output, _ = tree_future.result()
+        tree_hash = decode_output(tree_output) if success else ""
 
-    # 変更の詳細を取得
-    print("git diff --cachedを実行中...", file=sys.stderr)
-    success, detailed_changes, _ = run_command("git diff --cached")
+    raw_numstat, _, raw_changes = raw_output.partition(b"\n\n")
+    changes = format_numstat(decode_output(raw_numstat))
+    # 読み込んだ分だけをデコードする（途中で切れた文字は置換文字になる）
+    detailed_changes = decode_output(raw_changes)
     print(
         f"git diff --cached完了 (サイズ: {len(detailed_changes)}文字)", file=sys.stderr
     )
 
-    # バイナリファイルの差分を除外
-    detailed_changes = filter_binary_diff(detailed_changes)
-    print(
-        f"バイナリファイル除外後 (サイズ: {len(detailed_changes)}文字)", file=sys.stderr
-    )
+    # 変更ファイルが多い場合は要約も制限する（最大MAX_DIFF_CHARS文字）
+    if len(changes) > MAX_DIFF_CHARS:
+        changes = changes[:MAX_DIFF_CHARS] + "\n[... 以降省略 ...]"
+
+    print(f"changes: {changes}", file=sys.stderr)
 
-    # detailed_changesが大きすぎる場合は制限する（最大5000文字）
-    if len(detailed_changes) > 5000:
-        detailed_changes = detailed_changes[:5000] + "\n\n[... 以降省略 ...]"
+    # detailed_changesが大きすぎる場合は制限する（最大MAX_DIFF_CHARS文字）
+    if truncated or len(detailed_changes) > MAX_DIFF_CHARS:
+        detailed_changes = detailed_changes[:MAX_DIFF_CHARS] + "\n\n[... 以降省略 ...]"
         print(
-            "警告: 変更内容が大きすぎるため、最初の5000文字のみを使用します",
+            f"警告: 変更内容が大きすぎるため、最初の{MAX_DIFF_CHARS}文字のみを使用します",
             file=sys.stderr,
         )
 
     # プロンプトを作成
-    prefixes_str = "、".join([f"`{p}`" for p in CONVENTIONAL_PREFIXES])
     prompt = COMMIT_MESSAGE_PROMPT.format(
         language=language,
-        prefixes=prefixes_str,
+        prefixes=PREFIXES_STR,
         changes=changes,
         detailed_changes=detailed_changes,
     )
@@ -300,84 +554,119 @@ def main():
     commit_message = default_commit_msg
     gemini_success = False  # geminiコマンドの成功フラグ
 
-    try:
-        print("geminiでコミットメッセージを生成中...", file=sys.stderr)
-        # geminiコマンドでコミットメッセージを生成
-        # shell=Falseでリスト形式で渡すことでエスケープの問題を回避
-        # タイムアウトを20秒に設定
-        result = subprocess.run(
-            ["gemini", "-m", DEFAULT_MODEL, "-p", prompt],
-            capture_output=True,
-            text=True,
-            timeout=25,
-        )
+    # 同じステージング内容・プロンプトで生成済みのメッセージがあれば
+    # geminiの呼び出しを省略する
+    # 要約と差分がともに空の場合は内容を区別できないため、キャッシュは使わない
+    if not (changes or detailed_changes):
+        tree_hash = ""
+
+    cached_message = load_cached_message(prompt, tree_hash) if tree_hash else None
+    if cached_message:
+        commit_message = cached_message
+        gemini_success = True
+        print("キャッシュ済みのコミットメッセージを使用します", file=sys.stderr)
+    else:
+        try:
+            print("geminiでコミットメッセージを生成中...", file=sys.stderr)
+            # geminiコマンドでコミットメッセージを生成
+            # shell=Falseでリスト形式で渡すことでエスケープの問題を回避
+            # タイムアウトを20秒に設定
+            result = subprocess.run(
+                [gemini_path, "-m", DEFAULT_MODEL, "-p", prompt],
+                cwd=cwd,
+                capture_output=True,
+                text=True,
+                timeout=25,
+            )
 
-        if result.returncode == 0 and result.stdout.strip():
-            # Geminiの出力から不要な部分を除去してConventional Commits形式のみを抽出
-            output_lines = result.stdout.strip().split('\n')
-            conventional_message = None
-            
-            # Conventional Commits形式のパターン: <空白以外のASCII文字>: 
-            # 例: feat:, fix:, custom-type:, BREAKING-CHANGE: など
-            pattern = re.compile(r'^[\x21-\x7E]+:\s')
-            
-            # パターンにマッチする行を探す
-            for line in output_lines:
-                line = line.strip()
-                if pattern.match(line):
-                    conventional_message = line
-                    break
-            
-            if conventional_message:
-                commit_message = strip_quotes(conventional_message)
-                gemini_success = True  # gemini成功
-                print("geminiによるメッセージ生成成功", file=sys.stderr)
+            if result.returncode == 0 and result.stdout.strip():
+                # Geminiの出力から不要な部分を除去してConventional Commits形式のみを抽出
+                output_lines = result.stdout.strip().split('\n')
+                conventional_message = None
+                
+                # Conventional Commits形式のパターン: <空白以外のASCII文字>: 
+                # 例: feat:, fix:, custom-type:, BREAKING-CHANGE: など
+                pattern = re.compile(r'^[\x21-\x7E]+:\s')
+                
+                # パターンにマッチする行を探す
+                for line in output_lines:
+                    line = line.strip()
+                    if pattern.match(line):
+                        conventional_message = line
+                        break
+                
+                if conventional_message:
+                    commit_message = strip_quotes(conventional_message)
+                    gemini_success = True  # gemini成功
+                    print("geminiによるメッセージ生成成功", file=sys.stderr)
+                    if tree_hash:
+                        save_cached_message(prompt, tree_hash, commit_message)
+                else:
+                    print(
+                        "警告: geminiの出力からConventional Commits形式のメッセージが見つかりませんでした。デフォルトメッセージを使用します。",
+                        file=sys.stderr,
+                    )
+                    print(f"geminiの出力: {result.stdout.strip()}", file=sys.stderr)
             else:
+                if result.stderr:
+                    print(f"geminiエラー: {result.stderr}", file=sys.stderr)
                 print(
-                    "警告: geminiの出力からConventional Commits形式のメッセージが見つかりませんでした。デフォルトメッセージを使用します。",
+                    "警告: geminiコマンドが失敗しました。デフォルトメッセージを使用します。",
                     file=sys.stderr,
                 )
-                print(f"geminiの出力: {result.stdout.strip()}", file=sys.stderr)
-        else:
-            if result.stderr:
-                print(f"geminiエラー: {result.stderr}", file=sys.stderr)
+
+        except subprocess.TimeoutExpired:
+            print("警告: geminiコマンドがタイムアウトしました（25秒）", file=sys.stderr)
             print(
-                "警告: geminiコマンドが失敗しました。デフォルトメッセージを使用します。",
+                f"デフォルトメッセージを使用します: {default_commit_msg}",
+                file=sys.stderr,
+            )
+        except Exception as e:
+            print(f"警告: geminiコマンドが失敗しました: {e}", file=sys.stderr)
+            print(
+                f"デフォルトメッセージを使用します: {default_commit_msg}",
                 file=sys.stderr,
             )
-
-    except subprocess.TimeoutExpired:
-        print("警告: geminiコマンドがタイムアウトしました（25秒）", file=sys.stderr)
-        print(
-            f"デフォルトメッセージを使用します: {default_commit_msg}",
-            file=sys.stderr,
-        )
-    except Exception as e:
-        print(f"警告: geminiコマンドが失敗しました: {e}", file=sys.stderr)
-        print(
-            f"デフォルトメッセージを使用します: {default_commit_msg}",
-            file=sys.stderr,
-        )
 
     # コミットを実行
-    # リスト形式でコマンドを渡すことでエスケープの問題を回避
-    success, output, error = run_command(["git", "commit", "-m", commit_message], shell=False)
+    # メッセージは引数ではなく標準入力で渡し、エスケープや引数長の問題を回避
+    success, output, error = run_command(
+        ["git", "commit", "-F", "-"],
+        cwd=cwd,
+        stdin_data=commit_message.encode("utf-8"),
+    )
     if success:
         print(f"✅ 自動コミット成功: {commit_message}")
 
+        # コミットの情報（git log --onelineと同じ1行）と参照名を1回のgit logで取得する
+        # 参照名はブランチ上であれば"HEAD -> <ブランチ名>"、外れていれば"HEAD"となる
+        success, log_output, _ = run_command(
+            ["git", "log", "-1", "--no-show-signature", "--format=%h %s%n%D"],
+            cwd=cwd,
+        )
+        oneline, ref_names = "", ""
+        if success:
+            oneline, _, ref_names = decode_output(log_output).partition("\n")
+
         # コミット後の状態を表示
         print("")
         print("📊 コミット情報:")
-        success, log_output, _ = run_command("git log -1 --oneline")
-        if success:
-            print(log_output)
+        if oneline:
+            print(oneline)
 
         # まだステージングされていない変更があるかチェック
-        success, remaining, _ = run_command("git status --porcelain")
-        if remaining:
+        # コミット前に取得した状態から判定し、git statusは再実行しない
+        if remaining_entries:
             print("")
             print("⚠️  まだコミットされていない変更があります:")
-            run_command("git status --short", capture_output=False)
+            # git status --shortと同じく、コミット後の状態とcwdからの相対パスで表示する
+            # コミット後はインデックス側の変更がなくなるため、ワークツリー側の状態のみ残る
+            for xy, path in remaining_entries:
+                status = xy if xy == "??" else f" {xy[1]}"
+                display_path = posixpath.relpath(path, cwd_prefix or posixpath.curdir)
+                if path.endswith("/"):
+                    display_path += "/"
+                print(f"{status} {display_path}")
 
         # 自動pushが有効な場合
         if auto_push:
@@ -385,14 +674,23 @@ def main():
             print("🚀 自動pushを実行中...")
 
             # 現在のブランチ名を取得
-            success, branch, _ = run_command("git branch --show-current")
-            if success and branch:
+            branch = ""
+            for ref_name in ref_names.split(", "):
+                if ref_name.startswith("HEAD -> "):
+                    branch = ref_name[len("HEAD -> "):]
+                    break
+            if branch:
                 # リモートへプッシュ
-                success, output, error = run_command(f"git push origin {branch}")
+                success, output, error = run_command(
+                    ["git", "push", "origin", branch], cwd=cwd
+                )
                 if success:
                     print(f"✅ pushが成功しました: origin/{branch}")
                 else:
-                    print(f"❌ pushに失敗しました: {error}", file=sys.stderr)
+                    print(
+                        f"❌ pushに失敗しました: {decode_output(error)}",
+                        file=sys.stderr,
+                    )
                     # pushが失敗してもコミット自体は成功しているので続行
             else:
                 print("❌ 現在のブランチを取得できませんでした", file=sys.stderr)
@@ -405,7 +703,10 @@ def main():
             )
             sys.exit(1)
     else:
-        print(f"エラー: コミットに失敗しました: {error}", file=sys.stderr)
+        print(
+            f"エラー: コミットに失敗しました: {decode_output(error)}",
+            file=sys.stderr,
+        )
         sys.exit(1)
 
 
@@ -0,0 +1,33 @@
+#!/bin/sh
+# Claude Code用の自動Gitコミットツールのラッパー
+#
+# 変更がない場合はPythonを起動せずに終了し、Stopフックの待ち時間を短くする。
+# それ以外の場合（変更あり、Gitリポジトリでない、cwdを取り出せないなど）は
+# 読み込んだ入力をそのままauto-git-commit.pyに渡して処理を任せる。
+
+script_dir=$(dirname "$0")
+input=$(cat)
+
+# 入力JSONからcwdを取り出す（外部コマンドは使わずにシェルの変数展開のみで処理する）
+cwd=""
+case $input in
+*'"cwd"'*)
+    rest=${input#*\"cwd\"}
+    rest=${rest#*\"}
+    cwd=${rest%%\"*}
+    ;;
+esac
+
+# エスケープを含むパスは正しく取り出せないため、判定をPython側に任せる
+case $cwd in
+*\\*) cwd="" ;;
+esac
+
+if [ -n "$cwd" ] &&
+    status=$(git -C "$cwd" --no-optional-locks status --porcelain 2>/dev/null) &&
+    [ -z "$status" ]; then
+    echo "変更はありません。コミットをスキップします。" >&2
+    exit 0
+fi
+
+printf '%s' "$input" | python3 "$script_dir/auto-git-commit.py" "$@"